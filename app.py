@@ -1,25 +1,69 @@
 import gradio as gr
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 import pandas as pd
+import numpy as np
+import pyarrow.parquet as pq
 import warnings
 import re
+import threading
+from functools import lru_cache
+from numba import njit, prange
 
 # Suppress deprecation warnings to keep notebook/logs clean
 warnings.filterwarnings('ignore', category=DeprecationWarning)
 
+# gr.Plot ships figures via fig.to_json(); let Plotly use orjson, which encodes NumPy arrays in C
+pio.json.config.default_engine = 'orjson'
+
 # -----------------------------
 # Load and prepare base dataset
 # -----------------------------
 
-# Load integrated crashes + persons data from local Parquet file
-print("Loading data...")
-df = pd.read_parquet('nyc_crashes_integrated_clean.parquet')
+# Columns the app actually reads; Parquet is columnar, so the rest are never loaded
+USED_COLS = [
+    # Time keys
+    'CRASH_YEAR', 'CRASH_MONTH', 'CRASH_DAYOFWEEK', 'CRASH_HOUR',
+    # Crash / person attributes used by filters and charts
+    'COLLISION_ID', 'BOROUGH', 'PERSON_TYPE', 'PERSON_INJURY', 'PERSON_SEX',
+    'SAFETY_EQUIPMENT', 'POSITION_IN_VEHICLE', 'EJECTION', 'EMOTIONAL_STATUS',
+    'VEHICLE TYPE CODE 1', 'VEHICLE TYPE CODE 2',
+    'CONTRIBUTING FACTOR VEHICLE 1', 'CONTRIBUTING FACTOR VEHICLE 2',
+    # Map coordinates
+    'LATITUDE', 'LONGITUDE',
+    # Injury / fatality counts
+    'NUMBER OF PERSONS INJURED', 'NUMBER OF PERSONS KILLED',
+    'NUMBER OF PEDESTRIANS INJURED', 'NUMBER OF PEDESTRIANS KILLED',
+    'NUMBER OF CYCLIST INJURED', 'NUMBER OF CYCLIST KILLED',
+    'NUMBER OF MOTORIST INJURED', 'NUMBER OF MOTORIST KILLED'
+]
+
+# Low-cardinality string columns are stored as pandas categoricals, so filters and
+# groupbys compare/hash small integer codes instead of Python strings
+LOW_CARDINALITY_COLS = [
+    'BOROUGH', 'PERSON_TYPE', 'PERSON_INJURY', 'VEHICLE TYPE CODE 1', 'VEHICLE TYPE CODE 2',
+    'CONTRIBUTING FACTOR VEHICLE 1', 'CONTRIBUTING FACTOR VEHICLE 2', 'PERSON_SEX',
+    'SAFETY_EQUIPMENT', 'EJECTION', 'EMOTIONAL_STATUS', 'POSITION_IN_VEHICLE'
+]
 
-# Ensure CRASH DATE is a proper datetime for any temporal analysis
-df['CRASH DATE'] = pd.to_datetime(df['CRASH DATE'])
+# Load integrated crashes + persons data from local Parquet file. PyArrow reads it through a
+# memory map; split_blocks keeps one block per column (no consolidation copy) and
+# self_destruct frees each Arrow column as soon as it is converted, lowering peak memory.
+# read_dictionary keeps the low-cardinality columns dictionary-encoded as stored in the file,
+# so they arrive as categoricals without building a Python string per row.
+print("Loading data...")
+df = pq.read_table(
+    'nyc_crashes_integrated_clean.parquet', columns=USED_COLS, memory_map=True,
+    read_dictionary=LOW_CARDINALITY_COLS
+).to_pandas(split_blocks=True, self_destruct=True)
 print(f"Data loaded: {len(df):,} records")
 
+# Arrow dictionaries list values in first-seen order; sort them like astype('category') would,
+# so groupby outputs and category codes keep a stable alphabetical order
+for col in LOW_CARDINALITY_COLS:
+    df[col] = df[col].cat.reorder_categories(sorted(df[col].cat.categories))
+
 # -----------------------------------
 # Clean and normalize vehicle type columns
 # -----------------------------------
@@ -35,18 +79,28 @@ VALID_VEHICLE_TYPES = [
     'SPORT UTILITY / STATION WAGON', 'LIMOUSINE', 'UNKNOWN'
 ]
 
-# Map any unexpected vehicle types in VEHICLE TYPE CODE 1 to 'OTHER'
-df['VEHICLE TYPE CODE 1'] = df['VEHICLE TYPE CODE 1'].apply(
-    lambda x: x if x in VALID_VEHICLE_TYPES else 'OTHER'
+# Map any unexpected vehicle types in VEHICLE TYPE CODE 1 to 'OTHER'. On a categorical this is a
+# category-level operation: unknown categories become missing, then missing becomes 'OTHER'.
+df['VEHICLE TYPE CODE 1'] = (
+    df['VEHICLE TYPE CODE 1'].cat.set_categories(VALID_VEHICLE_TYPES + ['OTHER'])
+    .fillna('OTHER')
+    .cat.remove_unused_categories()
 )
 
 # For second vehicle: keep valid, or 'NO SECOND VEHICLE'; others go to 'OTHER'
-df['VEHICLE TYPE CODE 2'] = df['VEHICLE TYPE CODE 2'].apply(
-    lambda x: x if x in VALID_VEHICLE_TYPES or x == 'NO SECOND VEHICLE' else 'OTHER'
+df['VEHICLE TYPE CODE 2'] = (
+    df['VEHICLE TYPE CODE 2'].cat.set_categories(VALID_VEHICLE_TYPES + ['NO SECOND VEHICLE', 'OTHER'])
+    .fillna('OTHER')
+    .cat.remove_unused_categories()
 )
 
 print(f"Cleaned vehicle types. Valid categories: {len(df['VEHICLE TYPE CODE 1'].unique())}")
 
+# Fused day-of-week × hour key (dow * 24 + hour, 0..167) so day × hour counts read one uint8 column
+df['CRASH_DAYHOUR'] = (
+    df['CRASH_DAYOFWEEK'].to_numpy() * 24 + df['CRASH_HOUR'].to_numpy()
+).astype(np.uint8)
+
 # -----------------------------
 # Column groups for dropdowns
 # -----------------------------
@@ -66,15 +120,77 @@ NUMERIC_COLS = ['NUMBER OF PERSONS INJURED', 'NUMBER OF PERSONS KILLED',
                 'NUMBER OF CYCLIST INJURED', 'NUMBER OF CYCLIST KILLED',
                 'NUMBER OF MOTORIST INJURED', 'NUMBER OF MOTORIST KILLED']
 
+# Categories Chart 7 can compare injury/fatality rates across
+COMPARE_COLS = ['BOROUGH', 'VEHICLE TYPE CODE 1', 'PERSON_TYPE',
+                'SAFETY_EQUIPMENT', 'CRASH_HOUR', 'CRASH_DAYOFWEEK',
+                'CRASH_MONTH', 'CRASH_YEAR', 'POSITION_IN_VEHICLE', 'PERSON_SEX']
+
+# Chart 9 draws at most this many points; the map is rendered with WebGL, so tens of
+# thousands of markers still pan and zoom smoothly
+MAP_SAMPLE_SIZE = 25000
+
+# Columns read by the Chart 9 map (coordinates, severity inputs and hover details)
+MAP_COLS = [
+    'LATITUDE', 'LONGITUDE', 'NUMBER OF PERSONS INJURED', 'NUMBER OF PERSONS KILLED',
+    'BOROUGH', 'VEHICLE TYPE CODE 1'
+]
+
+# -----------------------------
+# Downcast numeric columns
+# -----------------------------
+
+# Injury/fatality counts are small non-negative integers: store them as uint8/uint16 so sums
+# stream 1-2 bytes per row instead of 8 (pandas and the Numba kernels still accumulate sums in 64-bit)
+for col in NUMERIC_COLS:
+    df[col] = pd.to_numeric(df[col], downcast='unsigned')
+
+# Date parts fit in small integer types as well
+df['CRASH_YEAR'] = df['CRASH_YEAR'].astype(np.int16)
+for col in ['CRASH_MONTH', 'CRASH_DAYOFWEEK', 'CRASH_HOUR']:
+    df[col] = df[col].astype(np.int8)
+
+# ------------------------------------------
+# Sort and block-index rows by (year, borough)
+# ------------------------------------------
+
+# With rows sorted by (year, borough), every year and every (year, borough) pair is one
+# contiguous block, so those filters become a row slice instead of a full-column scan
+df = df.sort_values(['CRASH_YEAR', 'BOROUGH'], kind='stable', ignore_index=True)
+
+_year_values, _year_starts, _year_counts = np.unique(
+    df['CRASH_YEAR'].to_numpy(), return_index=True, return_counts=True
+)
+YEAR_ROWS = {
+    int(y): slice(start, start + count)
+    for y, start, count in zip(_year_values, _year_starts, _year_counts)
+}
+YEAR_BOROUGH_ROWS = {
+    (int(y), b): slice(rows[0], rows[-1] + 1)
+    for (y, b), rows in df.groupby(['CRASH_YEAR', 'BOROUGH'], observed=True).indices.items()
+}
+
+# Category -> integer code per categorical column, so a filter resolves its value once and
+# then compares the small integer codes array instead of going through string matching
+CATEGORY_CODES = {
+    col: {c: code for code, c in enumerate(df[col].cat.categories)}
+    for col in LOW_CARDINALITY_COLS
+}
+
 # -----------------------------
 # Pre-compute dropdown options
 # -----------------------------
 
+# The categorical columns already know their distinct values (their categories), so the
+# option lists below read those instead of scanning millions of rows with .unique()
+def category_options(col, exclude=()):
+    """Sorted categories of a categorical column, minus missing-value labels and `exclude`."""
+    return sorted([c for c in df[col].cat.categories if str(c) != 'nan' and c not in exclude])
+
 # Unique boroughs + "All" option
-boroughs = ['All'] + sorted([b for b in df['BOROUGH'].dropna().unique() if str(b) != 'nan'])
+boroughs = ['All'] + category_options('BOROUGH')
 
-# Unique years + "All"
-years = ['All'] + sorted([int(y) for y in df['CRASH_YEAR'].unique()])
+# Unique years + "All" (already found by the np.unique pass that built YEAR_ROWS)
+years = ['All'] + list(YEAR_ROWS)
 
 # Months 1–12 + "All"
 months = ['All'] + list(range(1, 13))
@@ -83,24 +199,141 @@ months = ['All'] + list(range(1, 13))
 vehicles = ['All'] + sorted(VALID_VEHICLE_TYPES + ['OTHER'])
 
 # Person types + "All"
-person_types = ['All'] + sorted([p for p in df['PERSON_TYPE'].dropna().unique() if str(p) != 'nan'])
+person_types = ['All'] + category_options('PERSON_TYPE')
 
 # Injury types + "All"
-injury_types = ['All'] + sorted([i for i in df['PERSON_INJURY'].dropna().unique() if str(i) != 'nan'])
+injury_types = ['All'] + category_options('PERSON_INJURY')
 
 # Gender options (M/F/U) + "All"
 genders = ['All', 'M', 'F', 'U']
 
-# Safety equipment options, filtered to avoid noisy/unhelpful labels and limited to top ~15
+# Day-of-week labels (CRASH_DAYOFWEEK 0 = Monday) and the (label, code) checkbox choices
+day_names = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+dow_choices = [(name, code) for code, name in enumerate(day_names)]
+
+# Y-axis choices shared by Charts 1, 3 and 4: record count or a summed numeric column
+metrics = ['count'] + NUMERIC_COLS
+
+# Safety equipment options, filtered to avoid noisy/unhelpful labels and limited to the
+# ~15 most common. Counted with one np.bincount over the integer category codes (shifted by
+# one so missing values, code -1, land in slot 0 and are dropped), then ranked most frequent
+# first with a stable sort, the same order value_counts() gives.
+safety_categories = df['SAFETY_EQUIPMENT'].cat.categories
+safety_counts = np.bincount(
+    df['SAFETY_EQUIPMENT'].cat.codes.to_numpy().astype(np.intp) + 1,
+    minlength=len(safety_categories) + 1
+)[1:]
+safety_ranked = safety_categories[np.argsort(-safety_counts, kind='stable')]
 safety_equip = ['All'] + sorted(
-    [s for s in df['SAFETY_EQUIPMENT'].dropna().unique()
+    [s for s in safety_ranked
      if str(s) not in ['nan', 'NOT APPLICABLE', 'NOT REPORTED', 'DOES NOT APPLY']][:15]
 )
 
+# Default filter values + empty smart-search feedback, in the order the reset button outputs them
+RESET_VALUES = ('All', 'All', 'All', [], 0, 23, 'All', 'All', 'All', 'All', 'All', '')
+
+# ---------------------------------------------------------
+# Pre-aggregated day × hour cube for time/location filters
+# ---------------------------------------------------------
+
+# Index lookups for the cube axes; rows with no borough go to an extra last slot
+BOROUGH_INDEX = {b: i for i, b in enumerate(boroughs[1:])}
+YEAR_INDEX = {y: i for i, y in enumerate(years[1:])}
+
+_borough_codes = pd.Categorical(df['BOROUGH'], categories=boroughs[1:]).codes.astype(np.int64)
+_borough_codes[_borough_codes < 0] = len(BOROUGH_INDEX)
+
+# Planes of the day x hour totals: record count, persons injured, persons killed
+DAY_HOUR_PLANES = {'count': 0, 'NUMBER OF PERSONS INJURED': 1, 'NUMBER OF PERSONS KILLED': 2}
+
+# totals[plane, borough, year, month, day-of-week, hour] over the whole dataset; the three
+# planes are bincounts over the same flat cell index (the sums as weights)
+_cube_shape = (len(BOROUGH_INDEX) + 1, len(YEAR_INDEX), 12, 7 * 24)
+_cube_cells = np.ravel_multi_index(
+    (
+        _borough_codes,
+        np.searchsorted(np.asarray(years[1:]), df['CRASH_YEAR'].to_numpy()),
+        df['CRASH_MONTH'].to_numpy() - 1,
+        df['CRASH_DAYHOUR'].to_numpy()
+    ),
+    _cube_shape
+)
+DAY_HOUR_CUBE = np.stack([
+    np.bincount(_cube_cells, minlength=int(np.prod(_cube_shape))),
+    np.bincount(
+        _cube_cells, weights=df['NUMBER OF PERSONS INJURED'].to_numpy(),
+        minlength=int(np.prod(_cube_shape))
+    ).astype(np.int64),
+    np.bincount(
+        _cube_cells, weights=df['NUMBER OF PERSONS KILLED'].to_numpy(),
+        minlength=int(np.prod(_cube_shape))
+    ).astype(np.int64)
+]).reshape((3,) + _cube_shape[:3] + (7, 24))
+
 # -------------------------------------------------------
 # Smart search parser: parse natural language into filters
 # -------------------------------------------------------
 
+# Keyword vocabulary per filter, in priority order: when several keywords of one
+# filter appear in a query, the first one listed here wins
+SEARCH_BOROUGHS = {b.lower(): b for b in ['BROOKLYN', 'MANHATTAN', 'QUEENS', 'BRONX', 'STATEN ISLAND']}
+SEARCH_MONTHS = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
+    'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12,
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'jun': 6, 'jul': 7, 'aug': 8,
+    'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+# Map keywords (weekday, weekend, mon, tue, etc.) to underlying day indices (0=Mon..6=Sun)
+SEARCH_DAYS = {
+    'monday': [0], 'tuesday': [1], 'wednesday': [2], 'thursday': [3],
+    'friday': [4], 'saturday': [5], 'sunday': [6],
+    'mon': [0], 'tue': [1], 'wed': [2], 'thu': [3], 'fri': [4], 'sat': [5], 'sun': [6],
+    'weekday': [0, 1, 2, 3, 4], 'weekend': [5, 6]
+}
+SEARCH_TIMES = {
+    'morning': ((6, 10), "Morning (6-10)"),
+    'afternoon': ((12, 17), "Afternoon (12-17)"),
+    'evening': ((17, 20), "Evening (17-20)"),
+    'night': ((20, 23), "Night (20-23)"),
+    'late night': ((0, 5), "Late Night (0-5)"),
+    'midnight': ((0, 5), "Late Night (0-5)")
+}
+# Map vehicle keywords to normalized vehicle categories
+SEARCH_VEHICLES = {
+    'sedan': 'SEDAN', 'suv': 'STATION WAGON/SPORT UTILITY VEHICLE',
+    'taxi': 'TAXI', 'truck': 'PICK-UP TRUCK', 'bus': 'BUS',
+    'motorcycle': 'MOTORCYCLE', 'bike': 'BICYCLE', 'scooter': 'SCOOTER',
+    'van': 'VAN', 'ambulance': 'AMBULANCE', 'moped': 'MOPED'
+}
+SEARCH_PERSON_TYPES = {
+    'pedestrian': ('PEDESTRIAN', "Pedestrian"), 'cyclist': ('CYCLIST', "Cyclist"),
+    'occupant': ('OCCUPANT', "Occupant"), 'driver': ('OCCUPANT', "Occupant")
+}
+SEARCH_INJURIES = {
+    'fatal': ('KILLED', "Fatal"), 'death': ('KILLED', "Fatal"), 'killed': ('KILLED', "Fatal"),
+    'injured': ('INJURED', "Injured"), 'injury': ('INJURED', "Injured")
+}
+SEARCH_GENDERS = {'female': ('F', "Female"), 'male': ('M', "Male")}
+
+def _keyword_group(name, keywords):
+    """Named regex group matching any of `keywords`, longest first (so 'midnight' is not read as 'night')."""
+    alternatives = sorted(keywords, key=len, reverse=True)
+    return f"(?P<{name}>{'|'.join(re.escape(k) for k in alternatives)})"
+
+# All keywords in one compiled alternation with a named group per filter,
+# so a query is scanned once instead of once per keyword
+SEARCH_PATTERN = re.compile('|'.join([
+    _keyword_group('borough', SEARCH_BOROUGHS),
+    r'(?P<year>\b20[1-2][0-9]\b)',
+    _keyword_group('month', SEARCH_MONTHS),
+    _keyword_group('dow', SEARCH_DAYS),
+    _keyword_group('time', SEARCH_TIMES),
+    _keyword_group('vehicle', SEARCH_VEHICLES),
+    _keyword_group('person_type', SEARCH_PERSON_TYPES),
+    _keyword_group('injury', SEARCH_INJURIES),
+    _keyword_group('gender', SEARCH_GENDERS)
+]))
+
 def smart_search_parser(search_text):
     """Parse natural language search query into filter dictionary and human-readable summary.
 
@@ -112,192 +345,366 @@ def smart_search_parser(search_text):
         # No query → no filters
         return None
 
-    search_lower = search_text.lower()
+    # Single scan: collect the keywords found for each filter, in order of appearance
+    found = {}
+    for match in SEARCH_PATTERN.finditer(search_text.lower()):
+        found.setdefault(match.lastgroup, []).append(match.group())
+
+    def first_listed(group, vocabulary):
+        """Highest-priority keyword of `vocabulary` found in the query, or None."""
+        hits = found.get(group, ())
+        return next((k for k in vocabulary if k in hits), None)
+
     filters = {}
     applied_filters = []
 
     # --- Borough detection ---
-    boroughs_map = ['BROOKLYN', 'MANHATTAN', 'QUEENS', 'BRONX', 'STATEN ISLAND']
-    for b in boroughs_map:
-        if b.lower() in search_lower:
-            filters['borough'] = b
-            applied_filters.append(f"Borough: {b}")
-            break
-
-    # --- Year detection (any year 2010–2029 pattern like 2019, 2020, etc.) ---
-    years_found = re.findall(r'\b(20[1-2][0-9])\b', search_text)
-    if years_found:
-        filters['year'] = int(years_found[0])
-        applied_filters.append(f"Year: {years_found[0]}")
+    b = first_listed('borough', SEARCH_BOROUGHS)
+    if b:
+        filters['borough'] = SEARCH_BOROUGHS[b]
+        applied_filters.append(f"Borough: {SEARCH_BOROUGHS[b]}")
+
+    # --- Year detection (first year 2010–2029 in the query, like 2019, 2020, etc.) ---
+    if 'year' in found:
+        filters['year'] = int(found['year'][0])
+        applied_filters.append(f"Year: {found['year'][0]}")
 
     # --- Month detection using month names/abbreviations ---
-    months_map = {
-        'january': 1, 'february': 2, 'march': 3, 'april': 4, 'may': 5, 'june': 6,
-        'july': 7, 'august': 8, 'september': 9, 'october': 10, 'november': 11, 'december': 12,
-        'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'jun': 6, 'jul': 7, 'aug': 8,
-        'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-    }
-    for m_name, m_num in months_map.items():
-        if m_name in search_lower:
-            filters['month'] = m_num
-            applied_filters.append(f"Month: {m_name.capitalize()}")
-            break
+    m_name = first_listed('month', SEARCH_MONTHS)
+    if m_name:
+        filters['month'] = SEARCH_MONTHS[m_name]
+        applied_filters.append(f"Month: {m_name.capitalize()}")
 
     # --- Day-of-week detection ---
-    # Map keywords (weekday, weekend, mon, tue, etc.) to underlying day indices (0=Mon..6=Sun)
-    days_map = {
-        'monday': [0], 'tuesday': [1], 'wednesday': [2], 'thursday': [3],
-        'friday': [4], 'saturday': [5], 'sunday': [6],
-        'mon': [0], 'tue': [1], 'wed': [2], 'thu': [3], 'fri': [4], 'sat': [5], 'sun': [6],
-        'weekday': [0, 1, 2, 3, 4], 'weekend': [5, 6]
-    }
-    for day_name, day_nums in days_map.items():
-        if day_name in search_lower:
-            filters['dow'] = day_nums
-            applied_filters.append(f"Day: {day_name.capitalize()}")
-            break
+    day_name = first_listed('dow', SEARCH_DAYS)
+    if day_name:
+        filters['dow'] = SEARCH_DAYS[day_name]
+        applied_filters.append(f"Day: {day_name.capitalize()}")
 
     # --- Time-of-day detection based on common phrases ---
-    if 'morning' in search_lower:
-        filters['hour_range'] = (6, 10)
-        applied_filters.append("Time: Morning (6-10)")
-    elif 'afternoon' in search_lower:
-        filters['hour_range'] = (12, 17)
-        applied_filters.append("Time: Afternoon (12-17)")
-    elif 'evening' in search_lower:
-        filters['hour_range'] = (17, 20)
-        applied_filters.append("Time: Evening (17-20)")
-    elif 'night' in search_lower:
-        filters['hour_range'] = (20, 23)
-        applied_filters.append("Time: Night (20-23)")
-    elif 'late night' in search_lower or 'midnight' in search_lower:
-        filters['hour_range'] = (0, 5)
-        applied_filters.append("Time: Late Night (0-5)")
-
-    # --- Vehicle type detection: map keywords to normalized vehicle categories ---
-    vehicle_keywords = {
-        'sedan': 'SEDAN', 'suv': 'STATION WAGON/SPORT UTILITY VEHICLE',
-        'taxi': 'TAXI', 'truck': 'PICK-UP TRUCK', 'bus': 'BUS',
-        'motorcycle': 'MOTORCYCLE', 'bike': 'BICYCLE', 'scooter': 'SCOOTER',
-        'van': 'VAN', 'ambulance': 'AMBULANCE', 'moped': 'MOPED'
-    }
-    for keyword, vehicle_type in vehicle_keywords.items():
-        if keyword in search_lower:
-            filters['vehicle'] = vehicle_type
-            applied_filters.append(f"Vehicle: {keyword.capitalize()}")
-            break
+    time_name = first_listed('time', SEARCH_TIMES)
+    if time_name:
+        filters['hour_range'], time_label = SEARCH_TIMES[time_name]
+        applied_filters.append(f"Time: {time_label}")
+
+    # --- Vehicle type detection ---
+    keyword = first_listed('vehicle', SEARCH_VEHICLES)
+    if keyword:
+        filters['vehicle'] = SEARCH_VEHICLES[keyword]
+        applied_filters.append(f"Vehicle: {keyword.capitalize()}")
 
     # --- Person type detection: pedestrian, cyclist, occupant/driver ---
-    if 'pedestrian' in search_lower:
-        filters['person_type'] = 'PEDESTRIAN'
-        applied_filters.append("Person: Pedestrian")
-    elif 'cyclist' in search_lower:
-        filters['person_type'] = 'CYCLIST'
-        applied_filters.append("Person: Cyclist")
-    elif 'occupant' in search_lower or 'driver' in search_lower:
-        filters['person_type'] = 'OCCUPANT'
-        applied_filters.append("Person: Occupant")
+    keyword = first_listed('person_type', SEARCH_PERSON_TYPES)
+    if keyword:
+        filters['person_type'], person_label = SEARCH_PERSON_TYPES[keyword]
+        applied_filters.append(f"Person: {person_label}")
 
     # --- Injury type detection: fatal vs injured ---
-    if 'fatal' in search_lower or 'death' in search_lower or 'killed' in search_lower:
-        filters['injury'] = 'KILLED'
-        applied_filters.append("Injury: Fatal")
-    elif 'injured' in search_lower or 'injury' in search_lower:
-        filters['injury'] = 'INJURED'
-        applied_filters.append("Injury: Injured")
+    keyword = first_listed('injury', SEARCH_INJURIES)
+    if keyword:
+        filters['injury'], injury_label = SEARCH_INJURIES[keyword]
+        applied_filters.append(f"Injury: {injury_label}")
 
     # --- Gender detection: male/female ---
-    if 'male' in search_lower and 'female' not in search_lower:
-        filters['gender'] = 'M'
-        applied_filters.append("Gender: Male")
-    elif 'female' in search_lower:
-        filters['gender'] = 'F'
-        applied_filters.append("Gender: Female")
+    keyword = first_listed('gender', SEARCH_GENDERS)
+    if keyword:
+        filters['gender'], gender_label = SEARCH_GENDERS[keyword]
+        applied_filters.append(f"Gender: {gender_label}")
 
     return filters, applied_filters
 
+# ---------------------------------------------------
+# Fast aggregation kernels (Numba-compiled)
+# ---------------------------------------------------
+
+@njit(cache=True, parallel=True)
+def _group_totals_kernel(groups, n_groups, injured, killed):
+    """Total rows, injuries and fatalities per integer group code in [0, n_groups).
+
+    Returns a dense 3×n_groups array in DAY_HOUR_PLANES order, filled in a single pass.
+    Rows are split into a fixed number of contiguous chunks, each accumulated into its
+    own partial histogram by one thread, so there are no write conflicts; the partials
+    are summed at the end. (A fixed count keeps the function free of runtime globals so
+    Numba can cache it.)
+    """
+    n = groups.shape[0]
+    n_chunks = 64
+    chunk = (n + n_chunks - 1) // n_chunks
+    partial = np.zeros((n_chunks, 3, n_groups), dtype=np.int64)
+    for c in prange(n_chunks):
+        for i in range(c * chunk, min(n, (c + 1) * chunk)):
+            partial[c, 0, groups[i]] += 1
+            partial[c, 1, groups[i]] += injured[i]
+            partial[c, 2, groups[i]] += killed[i]
+    return partial.sum(axis=0)
+
+# Callbacks run concurrently, but Numba's default (workqueue) threading layer cannot run
+# parallel kernels from several threads at once, so launches take turns
+_KERNEL_LOCK = threading.Lock()
+
+def group_totals(groups, n_groups, injured, killed):
+    """Thread-safe entry point to the parallel group totals kernel (see _group_totals_kernel)."""
+    with _KERNEL_LOCK:
+        return _group_totals_kernel(groups, n_groups, injured, killed)
+
+@njit(cache=True, parallel=True)
+def _code_counts_kernel(codes, n_codes):
+    """Rows per category code in [0, n_codes); missing values (code -1) are skipped.
+
+    Same chunked per-thread partial histograms as _group_totals_kernel, but reads only
+    the codes, for charts that just need counts.
+    """
+    n = codes.shape[0]
+    n_chunks = 64
+    chunk = (n + n_chunks - 1) // n_chunks
+    partial = np.zeros((n_chunks, n_codes), dtype=np.int64)
+    for c in prange(n_chunks):
+        for i in range(c * chunk, min(n, (c + 1) * chunk)):
+            if codes[i] >= 0:
+                partial[c, codes[i]] += 1
+    return partial.sum(axis=0)
+
+def code_counts(codes, n_codes):
+    """Thread-safe entry point to the parallel category code counts kernel."""
+    with _KERNEL_LOCK:
+        return _code_counts_kernel(codes, n_codes)
+
+def day_hour_histogram(filtered_df):
+    """3×7×24 day × hour totals (DAY_HOUR_PLANES order) of the given rows."""
+    return group_totals(
+        filtered_df['CRASH_DAYHOUR'].to_numpy(), 7 * 24,
+        filtered_df['NUMBER OF PERSONS INJURED'].to_numpy(),
+        filtered_df['NUMBER OF PERSONS KILLED'].to_numpy()
+    ).reshape(3, 7, 24)
+
+# Compile the kernels once at import, on one row of the real columns, so each is built for the
+# argument types (dtype and read-only flag) that requests pass in. Otherwise the first summary
+# or chart would pay the JIT compile while holding _KERNEL_LOCK, stalling every concurrent
+# callback; with cache=True, later starts only load the compiled code.
+_warm_rows = df.iloc[:1]
+day_hour_histogram(_warm_rows)
+group_totals(
+    np.zeros(1, dtype=np.int64), 1,  # Chart 7 comparison groups are int64 offsets
+    _warm_rows['NUMBER OF PERSONS INJURED'].to_numpy(),
+    _warm_rows['NUMBER OF PERSONS KILLED'].to_numpy()
+)
+for col in LOW_CARDINALITY_COLS:
+    code_counts(_warm_rows[col].cat.codes.to_numpy(), len(df[col].cat.categories))
+
+def cube_totals(borough, year, month, dow, hour_min, hour_max):
+    """DAY_HOUR_CUBE for the given time/location filters: 3 × years × 12 × 7 × 24 totals.
+
+    The borough axis is summed (or the one borough picked); cells outside the selected
+    year, month, days and hour window are zeroed, so every marginal of the result
+    covers exactly the filtered rows.
+    """
+    if borough != 'All':
+        totals = DAY_HOUR_CUBE[:, BOROUGH_INDEX[borough]].copy()
+    else:
+        totals = DAY_HOUR_CUBE.sum(axis=1)
+    if year != 'All':
+        totals[:, np.arange(len(YEAR_INDEX)) != YEAR_INDEX[year]] = 0
+    if month != 'All':
+        totals[:, :, np.arange(12) != int(month) - 1] = 0
+    if dow:
+        totals[:, :, :, np.setdiff1d(np.arange(7), dow)] = 0
+    totals[..., :hour_min] = 0
+    totals[..., hour_max + 1:] = 0
+    return totals
+
+# ---------------------------------------------------
+# Figure templates: layout built once, copied per report
+# ---------------------------------------------------
+
+# Chart 7: grouped injury/fatality rate bars; only x/y and the x-axis title change per report
+RATE_COMPARISON_TEMPLATE = go.Figure(
+    data=[
+        go.Bar(name='Injury Rate (%)', marker_color='#f39c12'),
+        go.Bar(name='Fatality Rate (%)', marker_color='#e74c3c')
+    ],
+    layout=dict(
+        barmode='group',
+        template='plotly_white',
+        height=400,
+        title='Injury Rate Comparison',
+        yaxis_title='Rate (%)'
+    )
+)
+
+# Chart 8: day × hour heatmap; only z/x change per report
+HEATMAP_TEMPLATE = go.Figure(
+    data=go.Heatmap(
+        y=day_names,
+        colorscale='YlOrRd'
+    ),
+    layout=dict(
+        xaxis_title='Hour of Day',
+        yaxis_title='Day of Week',
+        title='Day × Hour Heatmap',
+        template='plotly_white',
+        height=500,
+        uirevision='chart8'
+    )
+)
+
 # ---------------------------------------------------
 # Core reporting function: filtering + all visualizations
 # ---------------------------------------------------
 
-def generate_report(
+def count_values(series):
+    """value_counts() of a categorical series, limited to values present in the series.
+
+    Codes are counted by the parallel Numba kernel, then sorted most frequent first exactly
+    as value_counts() sorts them. pandas would also list unobserved categories with a count
+    of 0; dropping them keeps top-N charts and min/max insights about real values only.
+    """
+    categories = series.cat.categories
+    counts = pd.Series(
+        code_counts(series.cat.codes.to_numpy(), len(categories)),
+        index=pd.CategoricalIndex(categories, categories=categories, name=series.name),
+        name='count'
+    ).sort_values(ascending=False, kind='stable')
+    return counts[counts > 0]
+
+def peak_and_low(labels, values):
+    """(label, value) of the largest and of the smallest entry, one argmax/argmin each.
+
+    Ties resolve to the first entry, as with idxmax()/idxmin().
+    """
+    values = np.asarray(values)
+    i, j = int(values.argmax()), int(values.argmin())
+    return labels[i], values[i], labels[j], values[j]
+
+def category_mask(frame, col, value):
+    """Boolean mask of the rows of `frame` whose categorical `col` equals `value`."""
+    # Values that are not a category (never seen in the data) get a code that cannot match
+    code = CATEGORY_CODES[col].get(value, -2)
+    return frame[col].cat.codes.to_numpy() == code
+
+def filter_data(
         borough, year, month, dow, hour_min, hour_max, vehicle, person_type,
-        person_injury, gender, safety, c1_x, c1_y, c3_x, c3_y, c3_top,
-        c4_x, c4_y, compare_cat
+        person_injury, gender, safety
 ):
-    """Generate summary stats + 9 charts + textual insights based on current filters and settings."""
-
-    # --------------------------------
-    # Apply all filters incrementally
-    # --------------------------------
-    filtered_df = df.copy()
+    """Apply all sidebar filters to the base dataset and return the matching rows."""
+
+    # ---------------------------------------------------------------
+    # Year (+ borough) is a contiguous block of rows: start from that
+    # ---------------------------------------------------------------
+    if year != 'All' and borough != 'All':
+        base = df.iloc[YEAR_BOROUGH_ROWS.get((year, borough), slice(0, 0))]
+    elif year != 'All':
+        base = df.iloc[YEAR_ROWS.get(year, slice(0, 0))]
+    else:
+        base = df
 
-    # Filter by borough, if specified
-    if borough != 'All':
-        filtered_df = filtered_df[filtered_df['BOROUGH'] == borough]
+    # ---------------------------------------------------------
+    # Collect one boolean array per active filter, then AND them in a single pass.
+    # Filters left at 'All' (and a full 0-23 hour window) add no clause at all.
+    # ---------------------------------------------------------
+    clauses = []
 
-    # Filter by year
-    if year != 'All':
-        filtered_df = filtered_df[filtered_df['CRASH_YEAR'] == year]
+    # Filter by borough, if specified (already applied by the row block when a year is set)
+    if borough != 'All' and year == 'All':
+        clauses.append(category_mask(base, 'BOROUGH', borough))
 
     # Filter by month
     if month != 'All':
-        filtered_df = filtered_df[filtered_df['CRASH_MONTH'] == month]
+        clauses.append(base['CRASH_MONTH'].to_numpy() == month)
 
     # Filter by day-of-week (list of numeric codes)
     if dow:
-        filtered_df = filtered_df[filtered_df['CRASH_DAYOFWEEK'].isin(dow)]
+        clauses.append(np.isin(base['CRASH_DAYOFWEEK'].to_numpy(), dow))
 
-    # Filter by hour range (inclusive)
-    filtered_df = filtered_df[
-        (filtered_df['CRASH_HOUR'] >= hour_min) &
-        (filtered_df['CRASH_HOUR'] <= hour_max)
-        ]
+    # Filter by hour range (inclusive); each bound only when it cuts something off
+    hours = base['CRASH_HOUR'].to_numpy()
+    if hour_min > 0:
+        clauses.append(hours >= hour_min)
+    if hour_max < 23:
+        clauses.append(hours <= hour_max)
 
     # Filter by vehicle type
     if vehicle != 'All':
-        filtered_df = filtered_df[filtered_df['VEHICLE TYPE CODE 1'] == vehicle]
+        clauses.append(category_mask(base, 'VEHICLE TYPE CODE 1', vehicle))
 
     # Filter by person type
     if person_type != 'All':
-        filtered_df = filtered_df[filtered_df['PERSON_TYPE'] == person_type]
+        clauses.append(category_mask(base, 'PERSON_TYPE', person_type))
 
     # Filter by injury type
     if person_injury != 'All':
-        filtered_df = filtered_df[filtered_df['PERSON_INJURY'] == person_injury]
+        clauses.append(category_mask(base, 'PERSON_INJURY', person_injury))
 
     # Filter by gender
     if gender != 'All':
-        filtered_df = filtered_df[filtered_df['PERSON_SEX'] == gender]
+        clauses.append(category_mask(base, 'PERSON_SEX', gender))
 
     # Filter by safety equipment
     if safety != 'All':
-        filtered_df = filtered_df[filtered_df['SAFETY_EQUIPMENT'] == safety]
+        clauses.append(category_mask(base, 'SAFETY_EQUIPMENT', safety))
 
-    # If all filters remove everything, return "empty" figures with a helpful message
+    # Nothing left to filter: the row block itself is the answer, no copy needed
+    if not clauses:
+        return base
+
+    # Materialize the matching rows once (index labels still point at df rows)
+    filtered_df = base[np.logical_and.reduce(clauses)]
+
+    return filtered_df
+
+# ---------------------------------------------------
+# Cached aggregates, keyed by the filter values only
+# ---------------------------------------------------
+
+def filter_key(
+        borough, year, month, dow, hour_min, hour_max, vehicle, person_type,
+        person_injury, gender, safety
+):
+    """Hashable cache key for a set of sidebar filters (chart settings are not part of it)."""
+    return (
+        borough, year, month, tuple(sorted(dow or ())), int(hour_min), int(hour_max),
+        vehicle, person_type, person_injury, gender, safety
+    )
+
+@lru_cache(maxsize=4)
+def filtered_rows(key):
+    """filter_data() for a filter_key(); kept small since every entry holds a row subset."""
+    return filter_data(*key)
+
+@lru_cache(maxsize=32)
+def filter_aggregates(key):
+    """Aggregates that depend on the filters alone: record count, summary text, day × hour
+    totals and, for time/location-only filters, the full cube slice (else None).
+
+    Returns None when the filters match no records. The cached objects are shared between
+    calls, so callers only ever read or slice them.
+    """
+    filtered_df = filtered_rows(key)
     if len(filtered_df) == 0:
-        empty_fig = go.Figure()
-        empty_fig.add_annotation(
-            text="No data found. Adjust filters.",
-            xref="paper", yref="paper",
-            x=0.5, y=0.5,
-            showarrow=False,
-            font=dict(size=16, color="gray")
-        )
-        return (
-            "No data found", empty_fig, "", empty_fig, "", empty_fig, "", empty_fig, "",
-            empty_fig, "", empty_fig, "", empty_fig, "", empty_fig, "", empty_fig, ""
-        )
+        return None
+    borough, year, month, dow, hour_min, hour_max, vehicle, person_type, \
+        person_injury, gender, safety = key
+
+    # Counts, injuries and fatalities per (day-of-week, hour) in one fused pass; they feed
+    # the summary and Charts 4/7/8. When only time/location filters are set, they come from
+    # the pre-aggregated cube, whose year and month marginals are kept as well; otherwise
+    # the filtered rows are totalled directly.
+    if all(v == 'All' for v in (vehicle, person_type, person_injury, gender, safety)):
+        time_totals = cube_totals(borough, year, month, dow, hour_min, hour_max)
+        day_hour = time_totals.sum(axis=(1, 2))
+    else:
+        time_totals = None
+        day_hour = day_hour_histogram(filtered_df)
 
     # -----------------------
     # Summary Statistics text
     # -----------------------
 
     total_records = len(filtered_df)
-    total_injuries = int(filtered_df['NUMBER OF PERSONS INJURED'].sum())
-    total_fatalities = int(filtered_df['NUMBER OF PERSONS KILLED'].sum())
+    total_injuries = int(day_hour[1].sum())
+    total_fatalities = int(day_hour[2].sum())
     injury_rate = (total_injuries / total_records * 100) if total_records > 0 else 0
     fatality_rate = (total_fatalities / total_records * 100) if total_records > 0 else 0
+    unique_crashes = filtered_df['COLLISION_ID'].nunique()
 
     # Markdown table summarizing key metrics for this filtered subset
     summary_text = f"""
@@ -310,20 +717,199 @@ def generate_report(
 | **Pedestrian Injuries** | {int(filtered_df['NUMBER OF PEDESTRIANS INJURED'].sum()):,} |
 | **Cyclist Injuries** | {int(filtered_df['NUMBER OF CYCLIST INJURED'].sum()):,} |
 | **Motorist Injuries** | {int(filtered_df['NUMBER OF MOTORIST INJURED'].sum()):,} |
-| **Unique Crashes** | {len(filtered_df['COLLISION_ID'].unique()):,} |
-| **Avg Persons/Crash** | {(total_records / len(filtered_df['COLLISION_ID'].unique())):.1f} |
+| **Unique Crashes** | {unique_crashes:,} |
+| **Avg Persons/Crash** | {(total_records / unique_crashes):.1f} |
+    """
+
+    return total_records, summary_text, day_hour, time_totals
+
+@lru_cache(maxsize=128)
+def category_counts(key, column):
+    """count_values() of `column` over the rows matching `key`, most frequent first.
+
+    Shared by Charts 2, 3, 5 and 6, so e.g. Chart 3 on PERSON_TYPE reuses the pie's counts.
     """
+    return count_values(filtered_rows(key)[column])
 
-    # -------------------------
-    # Chart 1: Trend Analysis
-    # -------------------------
+def time_marginals(key, by):
+    """Per-`by` totals of a temporal column read from the cached pre-aggregated planes.
+
+    Returns (group labels, 3×n totals in DAY_HOUR_PLANES order) for the groups with records.
+    Day-of-week and hour always work; year and month need the cube slice, so they return
+    None when other filters are set.
+    """
+    day_hour, time_totals = filter_aggregates(key)[2:]
+    if by == 'CRASH_DAYOFWEEK':
+        labels, totals = np.arange(7), day_hour.sum(axis=2)
+    elif by == 'CRASH_HOUR':
+        labels, totals = np.arange(24), day_hour.sum(axis=1)
+    elif time_totals is None:
+        return None
+    elif by == 'CRASH_YEAR':
+        labels, totals = np.asarray(years[1:]), time_totals.sum(axis=(2, 3, 4))
+    else:
+        labels, totals = np.arange(1, 13), time_totals.sum(axis=(1, 3, 4))
+    present = np.flatnonzero(totals[0])
+    return labels[present], totals[:, present]
+
+@lru_cache(maxsize=128)
+def grouped_totals(key, by, value):
+    """Record count (value == 'count') or sum of `value` per `by` group, sorted by group."""
+
+    # Temporal totals are marginals of the pre-aggregated planes when those are available
+    marginals = time_marginals(key, by) if by in TEMPORAL_COLS and value in DAY_HOUR_PLANES else None
+    if marginals is not None:
+        labels, totals = marginals
+        return pd.Series(
+            totals[DAY_HOUR_PLANES[value]],
+            index=pd.Index(labels, name=by),
+            name=None if value == 'count' else value
+        )
+
+    filtered_df = filtered_rows(key)
+
+    # Otherwise temporal columns are small integer ranges, so np.bincount totals them
+    # in one C loop (shifted by the smallest value so years do not allocate 2000+ bins)
+    if by in TEMPORAL_COLS:
+        groups = filtered_df[by].to_numpy().astype(np.int64)
+        offset = groups.min()
+        counts = np.bincount(groups - offset)
+        if value == 'count':
+            totals = counts
+        else:
+            totals = np.bincount(
+                groups - offset, weights=filtered_df[value].to_numpy()
+            ).astype(np.int64)
+        present = np.flatnonzero(counts)
+        return pd.Series(
+            totals[present],
+            index=pd.Index(present + offset, name=by),
+            name=None if value == 'count' else value
+        )
+
+    if value == 'count':
+        return filtered_df.groupby(by, observed=True).size()
+    return filtered_df.groupby(by, observed=True)[value].sum()
+
+@lru_cache(maxsize=32)
+def rate_comparison(key, compare_cat):
+    """Chart 7 data: (labels, injury rate %, fatality rate %) per `compare_cat` group."""
+
+    marginals = time_marginals(key, compare_cat) if compare_cat in TEMPORAL_COLS else None
+    if marginals is not None:
+        # Temporal groups are already totalled in the pre-aggregated planes
+        labels, totals = marginals
+        compare_data = pd.DataFrame({
+            compare_cat: labels,
+            'Total_Records': totals[0],
+            'Total_Injuries': totals[1],
+            'Total_Fatalities': totals[2]
+        })
+    else:
+        # Other categories are totalled by the Numba group kernel over integer group codes
+        filtered_df = filtered_rows(key)
+        column = filtered_df[compare_cat]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            # Category codes shifted by one: missing values (code -1) land in group 0,
+            # which is dropped below
+            groups = column.cat.codes.to_numpy().astype(np.int64) + 1
+            group_labels = np.concatenate([[None], column.cat.categories.to_numpy()])
+            first_group = 1
+        else:
+            # Year/month values offset by the smallest one
+            values = column.to_numpy().astype(np.int64)
+            groups = values - values.min()
+            group_labels = np.arange(values.min(), values.max() + 1)
+            first_group = 0
+        totals = group_totals(
+            groups, len(group_labels),
+            filtered_df['NUMBER OF PERSONS INJURED'].to_numpy(),
+            filtered_df['NUMBER OF PERSONS KILLED'].to_numpy()
+        )
+        present = first_group + np.flatnonzero(totals[0, first_group:])
+        compare_data = pd.DataFrame({
+            compare_cat: group_labels[present],
+            'Total_Records': totals[0, present],
+            'Total_Injuries': totals[1, present],
+            'Total_Fatalities': totals[2, present]
+        })
+    compare_data['Injury_Rate'] = (
+            compare_data['Total_Injuries'] / compare_data['Total_Records'] * 100
+    )
+    compare_data['Fatality_Rate'] = (
+            compare_data['Total_Fatalities'] / compare_data['Total_Records'] * 100
+    )
+
+    # If comparing by day-of-week, convert numeric codes to names and keep natural order
+    if compare_cat == 'CRASH_DAYOFWEEK':
+        day_mapping = {
+            0: 'Monday',
+            1: 'Tuesday',
+            2: 'Wednesday',
+            3: 'Thursday',
+            4: 'Friday',
+            5: 'Saturday',
+            6: 'Sunday'
+        }
+        compare_data[compare_cat] = compare_data[compare_cat].map(day_mapping)
+        day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+        compare_data[compare_cat] = pd.Categorical(
+            compare_data[compare_cat], categories=day_order, ordered=True
+        )
+        compare_data = compare_data.sort_values(compare_cat)
+    else:
+        # Otherwise, sort by highest injury rate and limit to top 15 for readability
+        compare_data = compare_data.sort_values('Injury_Rate', ascending=False).head(15)
+
+    # Materialize the plotted columns once; the chart reads plain NumPy arrays
+    return (
+        compare_data[compare_cat].to_numpy(),
+        compare_data['Injury_Rate'].to_numpy(),
+        compare_data['Fatality_Rate'].to_numpy()
+    )
+
+def no_data_figure():
+    """Placeholder figure shown when the filters match no records."""
+    empty_fig = go.Figure()
+    empty_fig.add_annotation(
+        text="No data found. Adjust filters.",
+        xref="paper", yref="paper",
+        x=0.5, y=0.5,
+        showarrow=False,
+        font=dict(size=16, color="gray")
+    )
+    return empty_fig
+
+# ---------------------------------------------------
+# Report outputs: summary + Charts 1-8, one function each
+# ---------------------------------------------------
+
+# Each output has its own callback taking the filter key, so Gradio can render the
+# charts side by side; they share the filtered rows and aggregates through the caches
+# above. The finished figures are cached too, keyed by filter key + chart settings, so
+# a repeated state (e.g. reset, then generate again) is answered without any work.
+# Callers must treat the returned figures as read-only.
+# (Chart 9, the map, lives on its own tab and is rendered by generate_map.)
+
+def make_summary(key):
+    """Summary statistics Markdown for the records matching the filters."""
+    aggregates = filter_aggregates(key)
+    if aggregates is None:
+        return "No data found"
+    return aggregates[1]
+
+@lru_cache(maxsize=32)
+def make_chart1(key, c1_x, c1_y):
+    """Chart 1: trend of a count or sum over the selected temporal column."""
+    if filter_aggregates(key) is None:
+        return no_data_figure(), ""
 
     # If c1_y is 'count', use counts per temporal bucket; else sum numeric column
     if c1_y == 'count':
-        chart1_data = filtered_df.groupby(c1_x).size().reset_index(name='count')
+        chart1_data = grouped_totals(key, c1_x, c1_y).reset_index(name='count')
         y_label = 'Number of Records'
     else:
-        chart1_data = filtered_df.groupby(c1_x)[c1_y].sum().reset_index()
+        chart1_data = grouped_totals(key, c1_x, c1_y).reset_index()
         y_label = c1_y
 
     # Line chart over selected temporal dimension
@@ -335,46 +921,53 @@ def generate_report(
         title='Trend Analysis'
     )
     fig1.update_traces(line_color='#3498db', line_width=3)
-    fig1.update_layout(template='plotly_white', height=400)
+    # uirevision: zoom/pan survive filter changes, reset when the x column changes
+    fig1.update_layout(template='plotly_white', height=400, uirevision=c1_x)
 
     # Simple insight: where is the peak and the minimum
-    max_val = chart1_data[chart1_data.columns[1]].max()
-    min_val = chart1_data[chart1_data.columns[1]].min()
-    max_cat = chart1_data.loc[chart1_data[chart1_data.columns[1]].idxmax(), c1_x]
-    min_cat = chart1_data.loc[chart1_data[chart1_data.columns[1]].idxmin(), c1_x]
+    max_cat, max_val, min_cat, min_val = peak_and_low(
+        chart1_data[c1_x].to_numpy(), chart1_data[chart1_data.columns[1]].to_numpy()
+    )
     insight1 = f"📈 **Insight:** Peak at {max_cat} ({max_val:,.0f}), lowest at {min_cat} ({min_val:,.0f})"
 
-    # --------------------------------
-    # Chart 2: Person Type Distribution
-    # --------------------------------
+    return fig1, insight1
+
+@lru_cache(maxsize=32)
+def make_chart2(key):
+    """Chart 2: person type distribution pie."""
+    if filter_aggregates(key) is None:
+        return no_data_figure(), ""
 
     # Pie chart of person types (pedestrian, cyclist, occupant, etc.)
-    person_type_data = filtered_df['PERSON_TYPE'].value_counts()
+    person_type_data = category_counts(key, 'PERSON_TYPE')
     fig2 = px.pie(
         values=person_type_data.values,
         names=person_type_data.index,
         title='Person Type Distribution',
         color_discrete_sequence=['#2ecc71', '#f39c12', '#e74c3c', '#3498db']
     )
-    fig2.update_layout(height=400)
+    fig2.update_layout(height=400, uirevision='chart2')
 
-    # Most common person type and its percentage share
-    most_common = person_type_data.idxmax()
-    pct = (person_type_data.max() / person_type_data.sum() * 100)
+    # Most common person type (counts come most frequent first) and its percentage share
+    most_common = person_type_data.index[0]
+    pct = (person_type_data.iloc[0] / person_type_data.sum() * 100)
     insight2 = f"🥧 **Insight:** Most common person type: {most_common} ({pct:.1f}% of records)"
 
-    # --------------------------------
-    # Chart 3: Categorical Analysis
-    # --------------------------------
+    return fig2, insight2
+
+@lru_cache(maxsize=32)
+def make_chart3(key, c3_x, c3_y, c3_top):
+    """Chart 3: top-N categories by record count or by a summed metric."""
+    if filter_aggregates(key) is None:
+        return no_data_figure(), ""
 
     # Either count per category or sum of numeric metric per category (top N)
     if c3_y == 'count':
-        chart3_data = filtered_df[c3_x].value_counts().head(int(c3_top))
+        chart3_data = category_counts(key, c3_x).head(int(c3_top))
         y_label = 'Number of Records'
     else:
         chart3_data = (
-            filtered_df.groupby(c3_x)[c3_y]
-            .sum()
+            grouped_totals(key, c3_x, c3_y)
             .sort_values(ascending=False)
             .head(int(c3_top))
         )
@@ -387,27 +980,26 @@ def generate_report(
         title=f'Categorical Analysis - Top {int(c3_top)}'
     )
     fig3.update_traces(marker_color='#3498db')
-    fig3.update_layout(template='plotly_white', height=400)
+    fig3.update_layout(template='plotly_white', height=400, uirevision=c3_x)
 
     # Highlight the highest and lowest categories shown
-    max_cat3 = chart3_data.idxmax()
-    min_cat3 = chart3_data.idxmin()
+    max_cat3, max_val3, min_cat3, min_val3 = peak_and_low(chart3_data.index, chart3_data.to_numpy())
     insight3 = (
-        f"📊 **Insight:** Highest: {max_cat3} ({chart3_data.max():,.0f}), "
-        f"Lowest: {min_cat3} ({chart3_data.min():,.0f})"
+        f"📊 **Insight:** Highest: {max_cat3} ({max_val3:,.0f}), "
+        f"Lowest: {min_cat3} ({min_val3:,.0f})"
     )
 
-    # ------------------------------
-    # Chart 4: Time Distribution
-    # ------------------------------
+    return fig3, insight3
+
+@lru_cache(maxsize=32)
+def make_chart4(key, c4_x, c4_y):
+    """Chart 4: count or sum over the selected temporal column, as bars."""
+    if filter_aggregates(key) is None:
+        return no_data_figure(), ""
 
     # Similar to Chart 3 but specifically for temporal axis (e.g., hour, month)
-    if c4_y == 'count':
-        chart4_data = filtered_df[c4_x].value_counts().sort_index()
-        y_label = 'Number of Records'
-    else:
-        chart4_data = filtered_df.groupby(c4_x)[c4_y].sum().sort_index()
-        y_label = c4_y
+    chart4_data = grouped_totals(key, c4_x, c4_y)
+    y_label = 'Number of Records' if c4_y == 'count' else c4_y
 
     fig4 = px.bar(
         x=chart4_data.index,
@@ -416,21 +1008,26 @@ def generate_report(
         title='Time Distribution'
     )
     fig4.update_traces(marker_color='#e67e22')
-    fig4.update_layout(template='plotly_white', height=400)
+    fig4.update_layout(template='plotly_white', height=400, uirevision=c4_x)
 
-    max_cat4 = chart4_data.idxmax()
-    min_cat4 = chart4_data.idxmin()
+    max_cat4, max_val4, min_cat4, min_val4 = peak_and_low(chart4_data.index, chart4_data.to_numpy())
     insight4 = (
-        f"⏰ **Insight:** Peak time: {max_cat4} ({chart4_data.max():,.0f}), "
-        f"Quietest: {min_cat4} ({chart4_data.min():,.0f})"
+        f"⏰ **Insight:** Peak time: {max_cat4} ({max_val4:,.0f}), "
+        f"Quietest: {min_cat4} ({min_val4:,.0f})"
     )
 
-    # ---------------------------------------
-    # Chart 5: Top Contributing Factor Vehicle 1
-    # ---------------------------------------
+    return fig4, insight4
+
+@lru_cache(maxsize=32)
+def make_chart5(key):
+    """Chart 5: top contributing factors for vehicle 1."""
+    aggregates = filter_aggregates(key)
+    if aggregates is None:
+        return no_data_figure(), ""
+    total_records = aggregates[0]
 
     # Frequency of primary contributing factors, excluding 'UNSPECIFIED'
-    factor1_data = filtered_df['CONTRIBUTING FACTOR VEHICLE 1'].value_counts().head(15)
+    factor1_data = category_counts(key, 'CONTRIBUTING FACTOR VEHICLE 1').head(15)
     factor1_data = factor1_data[factor1_data.index != 'UNSPECIFIED']
 
     fig5 = px.bar(
@@ -440,21 +1037,29 @@ def generate_report(
         title='Top Contributing Factors (Vehicle 1)'
     )
     fig5.update_traces(marker_color='#e74c3c')
-    fig5.update_layout(template='plotly_white', height=400, xaxis={'tickangle': -45})
+    fig5.update_layout(template='plotly_white', height=400, xaxis={'tickangle': -45}, uirevision='chart5')
 
-    top_factor1 = factor1_data.idxmax() if len(factor1_data) > 0 else "N/A"
-    top_factor1_pct = (factor1_data.max() / len(filtered_df) * 100) if len(factor1_data) > 0 else 0
+    # Factor counts come most frequent first, so the top cause is the first entry
+    top_factor1 = factor1_data.index[0] if len(factor1_data) > 0 else "N/A"
+    top_factor1_count = factor1_data.iloc[0] if len(factor1_data) > 0 else np.nan
+    top_factor1_pct = (top_factor1_count / total_records * 100) if len(factor1_data) > 0 else 0
     insight5 = (
         f"🚨 **Insight:** Top cause: {top_factor1} "
-        f"({factor1_data.max():,} crashes, {top_factor1_pct:.1f}%)"
+        f"({top_factor1_count:,} crashes, {top_factor1_pct:.1f}%)"
     )
 
-    # ---------------------------------------
-    # Chart 6: Top Contributing Factor Vehicle 2
-    # ---------------------------------------
+    return fig5, insight5
+
+@lru_cache(maxsize=32)
+def make_chart6(key):
+    """Chart 6: top contributing factors for vehicle 2."""
+    aggregates = filter_aggregates(key)
+    if aggregates is None:
+        return no_data_figure(), ""
+    total_records = aggregates[0]
 
     # Same idea as Chart 5 but for the second vehicle; exclude 'UNSPECIFIED' & 'NO SECOND VEHICLE'
-    factor2_data = filtered_df['CONTRIBUTING FACTOR VEHICLE 2'].value_counts().head(15)
+    factor2_data = category_counts(key, 'CONTRIBUTING FACTOR VEHICLE 2').head(15)
     factor2_data = factor2_data[~factor2_data.index.isin(['UNSPECIFIED', 'NO SECOND VEHICLE'])]
 
     if len(factor2_data) > 0:
@@ -465,13 +1070,13 @@ def generate_report(
             title='Top Contributing Factors (Vehicle 2)'
         )
         fig6.update_traces(marker_color='#f39c12')
-        fig6.update_layout(template='plotly_white', height=400, xaxis={'tickangle': -45})
+        fig6.update_layout(template='plotly_white', height=400, xaxis={'tickangle': -45}, uirevision='chart6')
 
-        top_factor2 = factor2_data.idxmax()
-        top_factor2_pct = (factor2_data.max() / len(filtered_df) * 100)
+        top_factor2 = factor2_data.index[0]
+        top_factor2_pct = (factor2_data.iloc[0] / total_records * 100)
         insight6 = (
             f"🚨 **Insight:** Top secondary cause: {top_factor2} "
-            f"({factor2_data.max():,} crashes, {top_factor2_pct:.1f}%)"
+            f"({factor2_data.iloc[0]:,} crashes, {top_factor2_pct:.1f}%)"
         )
     else:
         # If no secondary factors, show a placeholder figure and note
@@ -486,114 +1091,54 @@ def generate_report(
             "ℹ️ **Note:** Most crashes involve only one vehicle or have unspecified secondary factors"
         )
 
-    # ---------------------------------
-    # Chart 7: Injury & Fatality Rates
-    # ---------------------------------
-
-    # Group by the selected comparison category (e.g., BOROUGH, CRASH_HOUR)
-    compare_data = filtered_df.groupby(compare_cat).agg({
-        'COLLISION_ID': 'count',
-        'NUMBER OF PERSONS INJURED': 'sum',
-        'NUMBER OF PERSONS KILLED': 'sum'
-    }).reset_index()
-    compare_data.columns = [
-        compare_cat, 'Total_Records', 'Total_Injuries', 'Total_Fatalities'
-    ]
-    compare_data['Injury_Rate'] = (
-            compare_data['Total_Injuries'] / compare_data['Total_Records'] * 100
-    )
-    compare_data['Fatality_Rate'] = (
-            compare_data['Total_Fatalities'] / compare_data['Total_Records'] * 100
-    )
-
-    # If comparing by day-of-week, convert numeric codes to names and keep natural order
-    if compare_cat == 'CRASH_DAYOFWEEK':
-        day_mapping = {
-            0: 'Monday',
-            1: 'Tuesday',
-            2: 'Wednesday',
-            3: 'Thursday',
-            4: 'Friday',
-            5: 'Saturday',
-            6: 'Sunday'
-        }
-        compare_data[compare_cat] = compare_data[compare_cat].map(day_mapping)
-        day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        compare_data[compare_cat] = pd.Categorical(
-            compare_data[compare_cat], categories=day_order, ordered=True
-        )
-        compare_data = compare_data.sort_values(compare_cat)
-    else:
-        # Otherwise, sort by highest injury rate and limit to top 15 for readability
-        compare_data = compare_data.sort_values('Injury_Rate', ascending=False).head(15)
-
-    # Grouped bar chart for injury and fatality rates
-    fig7 = go.Figure()
-    fig7.add_trace(go.Bar(
-        x=compare_data[compare_cat],
-        y=compare_data['Injury_Rate'],
-        name='Injury Rate (%)',
-        marker_color='#f39c12'
-    ))
-    fig7.add_trace(go.Bar(
-        x=compare_data[compare_cat],
-        y=compare_data['Fatality_Rate'],
-        name='Fatality Rate (%)',
-        marker_color='#e74c3c'
-    ))
-    fig7.update_layout(
-        barmode='group',
-        template='plotly_white',
-        height=400,
-        title='Injury Rate Comparison',
-        xaxis_title=compare_cat,
-        yaxis_title='Rate (%)'
-    )
-
-    highest_injury = compare_data.loc[compare_data['Injury_Rate'].idxmax()]
-    highest_fatal = compare_data.loc[compare_data['Fatality_Rate'].idxmax()]
+    return fig6, insight6
+
+@lru_cache(maxsize=32)
+def make_chart7(key, compare_cat):
+    """Chart 7: injury and fatality rates across the selected comparison category."""
+    if filter_aggregates(key) is None:
+        return no_data_figure(), ""
+    compare_labels, injury_rates, fatality_rates = rate_comparison(key, compare_cat)
+
+    # Grouped bar chart for injury and fatality rates, patched onto the shared template
+    fig7 = go.Figure(RATE_COMPARISON_TEMPLATE)
+    fig7.data[0].x = compare_labels
+    fig7.data[0].y = injury_rates
+    fig7.data[1].x = compare_labels
+    fig7.data[1].y = fatality_rates
+    fig7.layout.xaxis.title.text = compare_cat
+    fig7.layout.uirevision = compare_cat
+
+    top_injury = injury_rates.argmax()
+    top_fatal = fatality_rates.argmax()
     insight7 = (
-        f"⚠️ **Insight:** Highest injury rate: {highest_injury[compare_cat]} "
-        f"({highest_injury['Injury_Rate']:.2f}%), "
-        f"Highest fatality rate: {highest_fatal[compare_cat]} "
-        f"({highest_fatal['Fatality_Rate']:.2f}%)"
+        f"⚠️ **Insight:** Highest injury rate: {compare_labels[top_injury]} "
+        f"({injury_rates[top_injury]:.2f}%), "
+        f"Highest fatality rate: {compare_labels[top_fatal]} "
+        f"({fatality_rates[top_fatal]:.2f}%)"
     )
 
-    # --------------------------
-    # Chart 8: Day × Hour Heatmap
-    # --------------------------
+    return fig7, insight7
 
-    # Cross-tab of crashes by (day-of-week, hour)
-    heatmap_data = (
-        filtered_df.groupby(['CRASH_DAYOFWEEK', 'CRASH_HOUR'])
-        .size()
-        .reset_index(name='count')
-    )
-    if len(heatmap_data) > 0:
-        heatmap_pivot = heatmap_data.pivot(
-            index='CRASH_DAYOFWEEK', columns='CRASH_HOUR', values='count'
-        )
+@lru_cache(maxsize=32)
+def make_chart8(key):
+    """Chart 8: day-of-week × hour heatmap within the selected hour window."""
+    aggregates = filter_aggregates(key)
+    if aggregates is None:
+        return no_data_figure(), ""
+    day_hour = aggregates[2]
+    hour_min, hour_max = key[4], key[5]
 
-        fig8 = go.Figure(
-            data=go.Heatmap(
-                z=heatmap_pivot.values,
-                x=heatmap_pivot.columns,
-                y=['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'],
-                colorscale='YlOrRd'
-            )
-        )
-        fig8.update_layout(
-            xaxis_title='Hour of Day',
-            yaxis_title='Day of Week',
-            title='Day × Hour Heatmap',
-            template='plotly_white',
-            height=500
-        )
+    # Cross-tab of crashes by (day-of-week, hour), restricted to the selected hour window
+    heatmap_counts = day_hour[0, :, int(hour_min):int(hour_max) + 1]
+    if heatmap_counts.any():
+        fig8 = go.Figure(HEATMAP_TEMPLATE)
+        fig8.data[0].z = heatmap_counts
+        fig8.data[0].x = list(range(int(hour_min), int(hour_max) + 1))
 
         # Find the busiest day overall and busiest hour overall
-        max_day = heatmap_pivot.sum(axis=1).idxmax()
-        max_hour = heatmap_pivot.sum(axis=0).idxmax()
-        day_names = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+        max_day = int(heatmap_counts.sum(axis=1).argmax())
+        max_hour = int(hour_min) + int(heatmap_counts.sum(axis=0).argmax())
         insight8 = (
             f"🗓️ **Insight:** Busiest day: {day_names[max_day]}, "
             f"Busiest hour: {max_hour}:00"
@@ -604,32 +1149,58 @@ def generate_report(
         fig8.update_layout(height=500, title='Day × Hour Heatmap')
         insight8 = ""
 
+    return fig8, insight8
+
+# ---------------------------------------------------
+# Map report: Chart 9, rendered only while the Map tab is open
+# ---------------------------------------------------
+
+def generate_map(
+        borough, year, month, dow, hour_min, hour_max, vehicle, person_type,
+        person_injury, gender, safety
+):
+    """Generate Chart 9 (geographic map) + insight for the given filters."""
+    return make_map(filter_key(
+        borough, year, month, dow, hour_min, hour_max, vehicle, person_type,
+        person_injury, gender, safety
+    ))
+
+@lru_cache(maxsize=8)
+def make_map(key):
+    """Chart 9 (map) + insight for a filter key, cached like the other charts.
+
+    Kept to a few entries, since each map holds up to MAP_SAMPLE_SIZE points.
+    """
+    filtered_df = filtered_rows(key)
+    if len(filtered_df) == 0:
+        return no_data_figure(), ""
+
     # -----------------------------
     # Chart 9: Geographic Map (NYC)
     # -----------------------------
 
-    # Basic spatial filter to remove invalid latitudes (NYC bounding box)
-    map_sample = filtered_df[
-        (filtered_df['LATITUDE'].notna()) &
-        (filtered_df['LATITUDE'] != 0) &
-        (filtered_df['LATITUDE'] > 40) &
-        (filtered_df['LATITUDE'] < 41)
-        ]
+    # Basic spatial filter to remove invalid latitudes (NYC bounding box).
+    # NaN and 0 latitudes fail the range check, so one pass over the raw array is enough.
+    lat = filtered_df['LATITUDE'].to_numpy()
+    valid_idx = np.flatnonzero((lat > 40) & (lat < 41))
 
-    if len(map_sample) > 0:
-        # Sample up to 3000 points for performance and responsiveness
-        map_sample = map_sample.sample(n=min(3000, len(map_sample)), random_state=42)
+    if len(valid_idx) > 0:
+        # Sample up to MAP_SAMPLE_SIZE points for responsiveness
+        # (same positions DataFrame.sample(random_state=42) would pick)
+        sample_pos = np.random.RandomState(42).choice(
+            len(valid_idx), size=min(MAP_SAMPLE_SIZE, len(valid_idx)), replace=False
+        )
 
-        # Helper: categorize crash severity for color-coding on map
-        def categorize_severity(row):
-            if row['NUMBER OF PERSONS KILLED'] > 0:
-                return 'Fatal'
-            elif row['NUMBER OF PERSONS INJURED'] > 0:
-                return 'Injury'
-            else:
-                return 'Property Damage Only'
+        # Take the sampled rows first, then project to the map columns, so only the sample
+        # (not every filtered row) is ever copied
+        map_sample = filtered_df.take(valid_idx[sample_pos])[MAP_COLS]
 
-        map_sample['SEVERITY_CATEGORY'] = map_sample.apply(categorize_severity, axis=1)
+        # Categorize crash severity for color-coding on map (fatal > injury > damage only)
+        killed = map_sample['NUMBER OF PERSONS KILLED'].to_numpy()
+        injured = map_sample['NUMBER OF PERSONS INJURED'].to_numpy()
+        map_sample['SEVERITY_CATEGORY'] = np.select(
+            [killed > 0, injured > 0], ['Fatal', 'Injury'], default='Property Damage Only'
+        )
 
         # Map severity categories to custom colors
         color_map = {
@@ -638,32 +1209,49 @@ def generate_report(
             'Property Damage Only': '#9d7aff'
         }
 
-        # NOTE: This assumes a plotly scatter-map function (e.g., scatter_mapbox / scatter_geo).
-        # The code uses px.scatter_map as written by you; keeping logic unchanged as requested.
-        fig9 = px.scatter_map(
-            map_sample,
-            lat='LATITUDE',
-            lon='LONGITUDE',
-            color='SEVERITY_CATEGORY',
-            color_discrete_map=color_map,
+        # One WebGL scatter trace per severity (a legend entry each), with per-point hover.
+        # Coordinates go out as compact float32 typed arrays (sub-metre at NYC latitudes);
+        # the hover fields go out as customdata, formatted by the browser through a
+        # hovertemplate instead of one hover string per point built here.
+        coords = map_sample[['LONGITUDE', 'LATITUDE']].to_numpy()
+        severity = map_sample['SEVERITY_CATEGORY'].to_numpy()
+        hover_fields = [
+            'NUMBER OF PERSONS INJURED', 'NUMBER OF PERSONS KILLED', 'BOROUGH', 'VEHICLE TYPE CODE 1'
+        ]
+        hover_data = map_sample[hover_fields].astype(object)
+        hover_data = hover_data.where(hover_data.notna(), None).to_numpy()
+        hover_lines = '<br>'.join(
+            f'{field}=%{{customdata[{i}]}}' for i, field in enumerate(hover_fields)
+        )
+        fig9 = go.Figure()
+        for category, color in color_map.items():
+            in_category = severity == category
+            fig9.add_trace(go.Scattermap(
+                lon=coords[in_category, 0].astype(np.float32),
+                lat=coords[in_category, 1].astype(np.float32),
+                mode='markers',
+                marker=dict(size=8, color=color),
+                name=category,
+                customdata=hover_data[in_category],
+                hovertemplate=f'SEVERITY_CATEGORY={category}<br>{hover_lines}<extra></extra>'
+            ))
+
+        center_lon, center_lat = coords.mean(axis=0)
+        fig9.update_layout(
             title=f'Geographic Distribution (Sample of {len(map_sample):,} locations)',
-            zoom=10,
             height=600,
-            hover_data={
-                'LATITUDE': False,
-                'LONGITUDE': False,
-                'SEVERITY_CATEGORY': True,
-                'NUMBER OF PERSONS INJURED': True,
-                'NUMBER OF PERSONS KILLED': True,
-                'BOROUGH': True,
-                'VEHICLE TYPE CODE 1': True
-            }
+            # Keep the user's pan/zoom while refining filters; re-center on a new borough
+            uirevision=key[0],
+            map=dict(
+                style='open-street-map',
+                center=dict(lat=center_lat, lon=center_lon),
+                zoom=10
+            )
         )
-        fig9.update_layout(map_style="open-street-map")
 
         # Summarize what is most common severity in the sample
         severity_counts = map_sample['SEVERITY_CATEGORY'].value_counts()
-        top_severity = severity_counts.idxmax() if len(severity_counts) > 0 else "N/A"
+        top_severity = severity_counts.index[0] if len(severity_counts) > 0 else "N/A"
         insight9 = (
             f"🗺️ **Insight:** Showing {len(map_sample):,} locations, "
             f"most common severity: {top_severity}"
@@ -680,11 +1268,15 @@ def generate_report(
         fig9.update_layout(height=600, title='Geographic Distribution')
         insight9 = ""
 
-    # Return all text + figures in the order expected by the Gradio interface
-    return (
-        summary_text, fig1, insight1, fig2, insight2, fig3, insight3, fig4, insight4,
-        fig5, insight5, fig6, insight6, fig7, insight7, fig8, insight8, fig9, insight9
-    )
+    return fig9, insight9
+
+def open_map_tab_flag():
+    """Mark the Map tab as visible, so report clicks re-render the map again."""
+    return True
+
+def close_map_tab():
+    """Mark the Map tab as hidden, so report clicks stop re-rendering the map."""
+    return False
 
 # ---------------------------------------------------
 # Smart search wrapper: connects parser to UI fields
@@ -716,6 +1308,10 @@ def apply_smart_search(search_text):
         feedback
     )
 
+def clear_search():
+    """Empty the smart-search box and its feedback line."""
+    return '', ''
+
 # ---------------------------
 # Gradio UI: layout + wiring
 # ---------------------------
@@ -762,8 +1358,7 @@ with gr.Blocks(title="NYC Motor Vehicle Crashes Dashboard") as demo:
 
             # Day-of-week checkbox group (allows multiple selection)
             dow = gr.CheckboxGroup(
-                choices=[('Mon', 0), ('Tue', 1), ('Wed', 2), ('Thu', 3),
-                         ('Fri', 4), ('Sat', 5), ('Sun', 6)],
+                choices=dow_choices,
                 label="Day of Week",
                 type="value"
             )
@@ -804,7 +1399,7 @@ with gr.Blocks(title="NYC Motor Vehicle Crashes Dashboard") as demo:
             )
             # Chart 1 Y-axis: either 'count' or one of numeric columns
             c1_y = gr.Dropdown(
-                choices=['count'] + NUMERIC_COLS,
+                choices=metrics,
                 value='count',
                 label="Chart 1 Y-axis"
             )
@@ -817,7 +1412,7 @@ with gr.Blocks(title="NYC Motor Vehicle Crashes Dashboard") as demo:
             )
             # Chart 3 measure: count or numeric column
             c3_y = gr.Dropdown(
-                choices=['count'] + NUMERIC_COLS,
+                choices=metrics,
                 value='count',
                 label="Chart 3 Y-axis"
             )
@@ -835,18 +1430,14 @@ with gr.Blocks(title="NYC Motor Vehicle Crashes Dashboard") as demo:
             )
             # Chart 4 Y-axis: count or numeric column
             c4_y = gr.Dropdown(
-                choices=['count'] + NUMERIC_COLS,
+                choices=metrics,
                 value='count',
                 label="Chart 4 Y-axis"
             )
 
             # Comparison category for Chart 7 (injury/fatality rate comparison)
             compare_cat = gr.Dropdown(
-                choices=[
-                    'BOROUGH', 'VEHICLE TYPE CODE 1', 'PERSON_TYPE',
-                    'SAFETY_EQUIPMENT', 'CRASH_HOUR', 'CRASH_DAYOFWEEK',
-                    'CRASH_MONTH', 'CRASH_YEAR', 'POSITION_IN_VEHICLE', 'PERSON_SEX'
-                ],
+                choices=COMPARE_COLS,
                 value='BOROUGH',
                 label="Comparison Category"
             )
@@ -867,102 +1458,209 @@ with gr.Blocks(title="NYC Motor Vehicle Crashes Dashboard") as demo:
     # Markdown area for summary statistics table
     summary_output = gr.Markdown(label="Summary Statistics")
 
-    # Row 1: Trend & Person Type distribution
-    with gr.Row():
-        with gr.Column():
-            chart1_output = gr.Plot(label="Chart 1: Trend Analysis")
-            insight1_output = gr.Markdown(label="Insight")
-        with gr.Column():
-            chart2_output = gr.Plot(label="Chart 2: Person Type Distribution")
-            insight2_output = gr.Markdown(label="Insight")
-
-    # Row 2: Categorical Analysis & Time Distribution
-    with gr.Row():
-        with gr.Column():
-            chart3_output = gr.Plot(label="Chart 3: Categorical Analysis")
-            insight3_output = gr.Markdown(label="Insight")
-        with gr.Column():
-            chart4_output = gr.Plot(label="Chart 4: Time Distribution")
-            insight4_output = gr.Markdown(label="Insight")
-
-    # Row 3: Contributing factors 1 & 2
-    with gr.Row():
-        with gr.Column():
-            chart5_output = gr.Plot(label="Chart 5: Contributing Factor 1")
-            insight5_output = gr.Markdown(label="Insight")
-        with gr.Column():
-            chart6_output = gr.Plot(label="Chart 6: Contributing Factor 2")
-            insight6_output = gr.Markdown(label="Insight")
+    # Charts 1-8 and the map live on separate tabs; the map is only rendered while its tab is open
+    with gr.Tabs():
+        with gr.Tab("📊 Charts") as charts_tab:
+            # Row 1: Trend & Person Type distribution
+            with gr.Row():
+                with gr.Column():
+                    chart1_output = gr.Plot(label="Chart 1: Trend Analysis")
+                    insight1_output = gr.Markdown(label="Insight")
+                with gr.Column():
+                    chart2_output = gr.Plot(label="Chart 2: Person Type Distribution")
+                    insight2_output = gr.Markdown(label="Insight")
+
+            # Row 2: Categorical Analysis & Time Distribution
+            with gr.Row():
+                with gr.Column():
+                    chart3_output = gr.Plot(label="Chart 3: Categorical Analysis")
+                    insight3_output = gr.Markdown(label="Insight")
+                with gr.Column():
+                    chart4_output = gr.Plot(label="Chart 4: Time Distribution")
+                    insight4_output = gr.Markdown(label="Insight")
+
+            # Row 3: Contributing factors 1 & 2
+            with gr.Row():
+                with gr.Column():
+                    chart5_output = gr.Plot(label="Chart 5: Contributing Factor 1")
+                    insight5_output = gr.Markdown(label="Insight")
+                with gr.Column():
+                    chart6_output = gr.Plot(label="Chart 6: Contributing Factor 2")
+                    insight6_output = gr.Markdown(label="Insight")
+
+            # Chart 7: Injury/Fatality rate comparison
+            chart7_output = gr.Plot(label="Chart 7: Injury Rate Comparison")
+            insight7_output = gr.Markdown(label="Insight")
+
+            # Chart 8: Day × Hour heatmap
+            chart8_output = gr.Plot(label="Chart 8: Day × Hour Heatmap")
+            insight8_output = gr.Markdown(label="Insight")
+
+        with gr.Tab("🗺️ Map") as map_tab:
+            # Chart 9: Map of crash locations and severity
+            chart9_output = gr.Plot(label="Chart 9: Geographic Distribution Map")
+            insight9_output = gr.Markdown(label="Insight")
 
-    # Chart 7: Injury/Fatality rate comparison
-    chart7_output = gr.Plot(label="Chart 7: Injury Rate Comparison")
-    insight7_output = gr.Markdown(label="Insight")
+    # ------------------- Event handlers / callbacks -------------------
 
-    # Chart 8: Day × Hour heatmap
-    chart8_output = gr.Plot(label="Chart 8: Day × Hour Heatmap")
-    insight8_output = gr.Markdown(label="Insight")
+    # Filter widgets shared by the report and the map, in generate_map argument order
+    filter_inputs = [
+        borough, year, month, dow, hour_min, hour_max, vehicle, person_type,
+        person_injury, gender, safety
+    ]
 
-    # Chart 9: Map of crash locations and severity
-    chart9_output = gr.Plot(label="Chart 9: Geographic Distribution Map")
-    insight9_output = gr.Markdown(label="Insight")
+    # Filters of the last generated report, filters the map currently shows, and Map tab visibility
+    report_filters = gr.State(None)
+    map_filters = gr.State(None)
+    map_tab_open = gr.State(False)
+
+    # Filter key of the last generated report (a small tuple; the rows it selects stay in
+    # the bounded filtered_rows cache rather than in per-session state)
+    report_key = gr.State(None)
+
+    # Helper to resolve the filters once: builds the key, filters the rows and computes the
+    # shared aggregates (all cached), and returns the summary right away
+    def prepare_report(*filters):
+        key = filter_key(*filters)
+        return key, make_summary(key)
+
+    # Helper to wrap a chart's output function so it leaves the chart alone when it already
+    # shows this filter key and these settings (e.g. only another chart's settings changed),
+    # rather than sending the same figure to the browser and redrawing it
+    def render_if_changed(make_output):
+        def render(key, *settings_and_shown):
+            *settings, shown = settings_and_shown
+            current = (key, *settings)
+            if current == shown:
+                return gr.skip(), gr.skip(), shown
+            return (*make_output(key, *settings), current)
+        render.__name__ = make_output.__name__
+        return render
+
+    # Each chart gets its own output function and settings widgets
+    chart_outputs = [
+        (make_chart1, [c1_x, c1_y], [chart1_output, insight1_output]),
+        (make_chart2, [], [chart2_output, insight2_output]),
+        (make_chart3, [c3_x, c3_y, c3_top], [chart3_output, insight3_output]),
+        (make_chart4, [c4_x, c4_y], [chart4_output, insight4_output]),
+        (make_chart5, [], [chart5_output, insight5_output]),
+        (make_chart6, [], [chart6_output, insight6_output]),
+        (make_chart7, [compare_cat], [chart7_output, insight7_output]),
+        (make_chart8, [], [chart8_output, insight8_output])
+    ]
 
-    # ------------------- Event handlers / callbacks -------------------
+    # Wire "Generate Report": filter once, then fan out one callback per chart reading the
+    # stored key, so the queue renders them in parallel and each appears as soon as it is ready.
+    # All report callbacks share one 'report' lane of 8 workers, so a burst of reports cannot
+    # also take the workers the map and other events need.
+    report_ready = generate_btn.click(
+        fn=prepare_report,
+        inputs=filter_inputs,
+        outputs=[report_key, summary_output],
+        concurrency_id='report',
+        concurrency_limit=8
+    )
+    for make_output, settings, outputs in chart_outputs:
+        # What this chart currently shows: (filter key, *settings), one state per chart so the
+        # parallel callbacks never write the same state
+        shown = gr.State(None)
+        report_ready.then(
+            fn=render_if_changed(make_output),
+            inputs=[report_key] + settings + [shown],
+            outputs=outputs + [shown],
+            concurrency_id='report'
+        )
+
+    # Helper to remember the report filters and re-render the map only if its tab is visible
+    def refresh_map(map_open, *filters):
+        if not map_open:
+            return filters, gr.update(), gr.update(), gr.update()
+        return (filters, filters) + generate_map(*filters)
 
-    # Wire "Generate Report" button to the generate_report function
+    # "Generate Report" also refreshes the map, independently of the chart callback
+    # Map renders hold a large point sample each, so they get their own lane of 2 workers.
     generate_btn.click(
-        fn=generate_report,
-        inputs=[
-            borough, year, month, dow, hour_min, hour_max, vehicle, person_type,
-            person_injury, gender, safety, c1_x, c1_y, c3_x, c3_y, c3_top,
-            c4_x, c4_y, compare_cat
-        ],
-        outputs=[
-            summary_output,
-            chart1_output, insight1_output,
-            chart2_output, insight2_output,
-            chart3_output, insight3_output,
-            chart4_output, insight4_output,
-            chart5_output, insight5_output,
-            chart6_output, insight6_output,
-            chart7_output, insight7_output,
-            chart8_output, insight8_output,
-            chart9_output, insight9_output
-        ]
+        fn=refresh_map,
+        inputs=[map_tab_open] + filter_inputs,
+        outputs=[report_filters, map_filters, chart9_output, insight9_output],
+        concurrency_id='map',
+        concurrency_limit=2
+    )
+
+    # Helper to render the map when its tab is opened, unless it already shows the last report.
+    # It may wait in the map lane, so it re-checks the tab is still open before rendering.
+    def open_map_tab(map_open, last_report, shown):
+        if not map_open or last_report is None or last_report == shown:
+            return gr.update(), gr.update(), gr.update()
+        return (last_report,) + generate_map(*last_report)
+
+    # Tab visibility flips immediately on both tabs (queue=False), so a map render still waiting
+    # in the queue can never mark the tab open again after the user has left it
+    map_tab.select(
+        fn=open_map_tab_flag, outputs=[map_tab_open], queue=False
+    ).then(
+        fn=open_map_tab,
+        inputs=[map_tab_open, report_filters, map_filters],
+        outputs=[map_filters, chart9_output, insight9_output],
+        concurrency_id='map'
     )
+    charts_tab.select(fn=close_map_tab, outputs=[map_tab_open], queue=False)
 
-    # Helper to reset all filters to default values and clear smart-search feedback
-    def reset_all():
-        # Return values in the same order as reset_btn.click outputs
-        return ('All', 'All', 'All', [], 0, 23, 'All', 'All', 'All', 'All', 'All', '')
+    # Components the reset button restores, in the same order as RESET_VALUES
+    reset_outputs = [
+        borough, year, month, dow, hour_min, hour_max, vehicle, person_type,
+        person_injury, gender, safety, search_feedback
+    ]
 
-    # Wire "Reset All Filters" button to reset_all helper
+    # Helper to reset all filters to default values and clear smart-search feedback.
+    # Returns a dict so only the components that are not already at their default are sent back.
+    def reset_all(*current):
+        updates = {
+            component: default
+            for component, value, default in zip(reset_outputs, current, RESET_VALUES)
+            if value != default
+        }
+        # Gradio reads an empty dict as one plain value, so spell out "no change" for everything
+        return updates or tuple(gr.skip() for _ in reset_outputs)
+
+    # Wire "Reset All Filters" button to reset_all helper. It only compares against constants,
+    # so it skips the queue and progress overlay and is answered immediately.
     reset_btn.click(
         fn=reset_all,
-        outputs=[
-            borough, year, month, dow, hour_min, hour_max, vehicle, person_type,
-            person_injury, gender, safety, search_feedback
-        ]
+        inputs=reset_outputs,
+        outputs=reset_outputs,
+        queue=False,
+        show_progress='hidden'
     )
 
-    # Wire "Apply Smart Search" button to smart search function
+    # Wire "Apply Smart Search" button to smart search function. Parsing is one regex pass
+    # over a short query, so like reset it answers directly instead of waiting behind reports.
     search_btn.click(
         fn=apply_smart_search,
         inputs=[search_input],
         outputs=[
             borough, year, month, dow, hour_min, hour_max, vehicle, person_type,
             person_injury, gender, safety, search_feedback
-        ]
+        ],
+        queue=False
     )
 
     # Wire "Clear" button to reset search box and feedback only
     clear_search_btn.click(
-        fn=lambda: ('', ''),
-        outputs=[search_input, search_feedback]
+        fn=clear_search,
+        outputs=[search_input, search_feedback],
+        queue=False,
+        show_progress='hidden'
     )
 
 # -------------------
 # App entry point
 # -------------------
 if __name__ == "__main__":
+    # Serve up to 8 callbacks at once (Gradio runs one per event by default), so one
+    # user's report does not queue behind another's; report and map events have their own
+    # lanes (concurrency_id). The queue is bounded: a report is 9 events, so 64 is a handful
+    # of waiting reports, and clicks beyond that are turned away instead of piling up.
     # Launch Gradio app (no public sharing by default)
+    demo.queue(default_concurrency_limit=8, max_size=64)
     demo.launch(share=False)